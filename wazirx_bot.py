@@ -3,9 +3,21 @@ from flask import Flask, request, jsonify
 import ccxt
 from wazirx_config import *
 from datetime import datetime, timedelta
+from dataclasses import dataclass, asdict
 import json
+import math
 import time
+import queue
+import random
+import functools
+import types
+import hmac
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 app = Flask(__name__)
 
@@ -19,86 +31,397 @@ exchange = ccxt.wazirx({
     }
 })
 
+# ============= PRECOMPUTED LOOKUPS =============
+# Built once from config so per-alert checks are O(1)
+_RESTRICTED_HOURS_MASK = sum(1 << h for h in set(RESTRICTED_HOURS))
+
+@functools.lru_cache(maxsize=128)
+def resolve_symbol(tv_symbol):
+    """TradingView symbol -> WazirX symbol (btcusdt)"""
+    return SYMBOL_MAP.get(tv_symbol, tv_symbol).lower()
+
+# ============= MARKETS CACHE =============
+_markets_cache = None
+_markets_cache_time = 0.0
+_markets_lock = threading.Lock()
+_precision_cache = {}  # {market id: {'amount': ..., 'price': ...}}, rebuilt with the markets
+
+# ============= PRICE CACHE =============
+_price_cache = {}  # {symbol: (price, fetched_at)}
+_price_lock = threading.Lock()
+
+# ============= BALANCE CACHE =============
+_balance_cache = None
+_balance_cache_time = 0.0
+_balance_generation = 0  # Bumped on invalidate; fetches that straddle a bump aren't cached
+_balance_lock = threading.Lock()  # Makes invalidate vs. the generation check-and-store atomic
+_balance_refresh_lock = threading.Lock()  # Held while a background refresh runs
+
 # ============= DAILY TRACKING =============
+def next_midnight_timestamp(day):
+    """Epoch seconds of local midnight at the end of `day`"""
+    return datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+
 daily_pnl_usdt = 0
 daily_pnl_inr = 0
 last_reset_date = datetime.now().date()
+next_reset_ts = next_midnight_timestamp(last_reset_date)  # Cheap float check per call
 total_trades_today = 0
 winning_trades_today = 0
 losing_trades_today = 0
+counters_lock = threading.Lock()  # Guards the daily P&L / trade counters above
 
 # ============= ACTIVE ORDERS TRACKING =============
-active_orders = {}  # {order_id: {symbol, side, sl, tp, entry_price}}
+@dataclass(slots=True, frozen=True)
+class Order:
+    symbol: str  # WazirX market id (btcusdt), passed to ccxt as is
+    side: str
+    quantity: float
+    entry_price: float
+    sl_price: float
+    tp_price: float
+    timestamp: datetime
+
+# Copy-on-write: writers build a new dict under orders_lock and swap the
+# reference, readers just grab `active_orders` and iterate it without locking.
+# Never mutate the dict in place (Order entries are frozen).
+active_orders = {}  # {order_id: Order}
+orders_lock = threading.Lock()
+order_event = threading.Event()  # Set when an order is added, wakes the monitor
+
+def add_active_order(order_id, order_info, wake_monitor=True):
+    global active_orders
+    with orders_lock:
+        active_orders = {**active_orders, order_id: order_info}
+    if wake_monitor:
+        order_event.set()
+
+def pop_active_order(order_id):
+    """
+    Remove and return an order, or None if it's already gone. Whoever gets
+    the Order back owns it, which stops two threads closing it twice.
+    """
+    global active_orders
+    with orders_lock:
+        if order_id not in active_orders:
+            return None
+        orders = dict(active_orders)
+        order_info = orders.pop(order_id)
+        active_orders = orders
+    return order_info
 
 def reset_daily_tracker():
     global daily_pnl_usdt, daily_pnl_inr, last_reset_date, total_trades_today
-    global winning_trades_today, losing_trades_today
+    global winning_trades_today, losing_trades_today, next_reset_ts
     
-    today = datetime.now().date()
-    if today != last_reset_date:
+    if time.time() < next_reset_ts:
+        return
+    
+    with counters_lock:
+        if time.time() < next_reset_ts:
+            return
+        today = datetime.now().date()
+        next_reset_ts = next_midnight_timestamp(today)
         daily_pnl_usdt = 0
         daily_pnl_inr = 0
         total_trades_today = 0
         winning_trades_today = 0
         losing_trades_today = 0
         last_reset_date = today
-        log_message(f"✅ Daily tracker reset: {today}")
+    log_message(f"✅ Daily tracker reset: {today}")
 
 # ============= LOGGING =============
+# File writes happen on a background thread so callers never block on disk I/O
+log_queue = queue.Queue()
+LOG_BATCH_SIZE = 256
+
+def log_writer_loop():
+    """
+    Keep the log file open and write whatever has queued up in one go.
+    A None entry is the shutdown signal.
+    """
+    try:
+        f = open(LOG_FILE_PATH, "a", encoding="utf-8")
+    except Exception as e:
+        print(f"❌ Logging error: {e}")
+        return
+    
+    with f:
+        while True:
+            batch = [log_queue.get()]
+            try:
+                while len(batch) < LOG_BATCH_SIZE:
+                    batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            stop = None in batch
+            entries = [entry for entry in batch if entry is not None]
+            if entries:
+                try:
+                    f.write("\n".join(entries) + "\n")
+                    f.flush()
+                except Exception as e:
+                    print(f"❌ Logging error: {e}")
+            if stop:
+                return
+
+def stop_log_writer():
+    log_queue.put(None)
+    log_writer_thread.join(timeout=2)
+
+log_writer_thread = threading.Thread(target=log_writer_loop, daemon=True)
+if LOG_TRADES_TO_FILE:
+    log_writer_thread.start()
+    atexit.register(stop_log_writer)
+
 def log_message(message):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     log_entry = f"[{timestamp}] {message}"
     print(log_entry)
     
-    if LOG_TRADES_TO_FILE:
+    if LOG_TRADES_TO_FILE and log_writer_thread.is_alive():
+        log_queue.put_nowait(log_entry)
+
+# ============= TELEGRAM NOTIFICATIONS =============
+# One pooled keep-alive session instead of a new TLS handshake per message
+telegram_session = requests.Session()
+telegram_session.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+
+# Messages are sent from a background thread; capped so an outage can't eat memory
+telegram_queue = queue.Queue(maxsize=100)
+
+def telegram_sender_loop():
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    while True:
+        message = telegram_queue.get()
         try:
-            with open(LOG_FILE_PATH, "a", encoding="utf-8") as f:
-                f.write(log_entry + "\n")
+            data = {
+                "chat_id": TELEGRAM_CHAT_ID,
+                "text": message,
+                "parse_mode": "HTML"
+            }
+            telegram_session.post(url, data=data, timeout=5)
         except Exception as e:
-            print(f"❌ Logging error: {e}")
+            log_message(f"❌ Telegram error: {e}")
+
+telegram_sender_thread = threading.Thread(target=telegram_sender_loop, daemon=True)
+if TELEGRAM_ENABLED and TELEGRAM_BOT_TOKEN:
+    telegram_sender_thread.start()
 
-# ============= TELEGRAM NOTIFICATIONS =============
 def send_telegram(message):
     if not TELEGRAM_ENABLED or not TELEGRAM_BOT_TOKEN:
         return
     
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        data = {
-            "chat_id": TELEGRAM_CHAT_ID,
-            "text": message,
-            "parse_mode": "HTML"
-        }
-        requests.post(url, data=data, timeout=5)
-    except Exception as e:
-        log_message(f"❌ Telegram error: {e}")
+        telegram_queue.put_nowait(message)
+    except queue.Full:
+        log_message(f"❌ Telegram queue full, dropped: {message}")
+
+# ============= RETRY =============
+# Transient failures worth another attempt. Everything else (auth errors,
+# bad symbols, insufficient funds, ...) is raised on the first failure.
+RETRYABLE_ERRORS = (ccxt.NetworkError, requests.ConnectionError)
+
+def retry_on_failure(max_retries=3, delay=1, retry_on=RETRYABLE_ERRORS):
+    """
+    Retry `retry_on` errors with capped exponential backoff plus jitter.
+    Rate limits back off faster than other network errors.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_retries):
+                try:
+                    return func(*args, **kwargs)
+                except retry_on as e:
+                    if attempt == max_retries - 1:
+                        raise
+                    
+                    # Both are direct NetworkError subclasses; ccxt maps HTTP 429 to RateLimitExceeded
+                    if isinstance(e, (ccxt.RateLimitExceeded, ccxt.DDoSProtection)):
+                        wait = min(60, delay * 4 ** attempt)
+                    else:
+                        wait = min(30, delay * 2 ** attempt)
+                    # Scale by 0.5-1.5x so threads that failed together don't retry together
+                    wait *= 0.5 + random.random()
+                    
+                    log_message(f"⚠️ {func.__name__} failed ({e}), retry {attempt + 1}/{max_retries - 1} in {wait:.1f}s")
+                    time.sleep(wait)
+        return wrapper
+    return decorator
+
+# ============= EXCHANGE READS =============
+# Read-only calls are safe to repeat; order creation is never retried
+@retry_on_failure()
+def fetch_balance():
+    return exchange.fetch_balance()
+
+@retry_on_failure()
+def fetch_ticker(symbol):
+    return exchange.fetch_ticker(symbol)
+
+@retry_on_failure()
+def fetch_tickers(symbols):
+    return exchange.fetch_tickers(symbols)
+
+@retry_on_failure()
+def fetch_order(order_id, symbol):
+    return exchange.fetch_order(order_id, symbol)
+
+@retry_on_failure()
+def load_markets():
+    return exchange.load_markets(reload=True)
 
 # ============= GET CURRENT BALANCE =============
-def get_balance():
+def get_balance(refresh=False):
+    global _balance_cache, _balance_cache_time
+    
+    cached = _balance_cache
+    if not refresh and cached and time.monotonic() - _balance_cache_time < BALANCE_CACHE_TTL_SECONDS:
+        return cached
+    
     try:
-        balance = exchange.fetch_balance()
+        generation = _balance_generation
+        balance = fetch_balance()
         usdt_free = balance.get('USDT', {}).get('free', 0)
         usdt_total = balance.get('USDT', {}).get('total', 0)
         
-        return {
+        result = {
             'usdt_free': usdt_free,
             'usdt_total': usdt_total
         }
+        # Funds moved while this fetch was in flight: it may predate the move,
+        # so return it to this caller but don't cache it for the next one
+        with _balance_lock:
+            if generation == _balance_generation:
+                _balance_cache = result
+                _balance_cache_time = time.monotonic()
+        return result
     except Exception as e:
         log_message(f"❌ Balance fetch error: {e}")
         return {'usdt_free': 0, 'usdt_total': 0}
 
+def invalidate_balance_cache():
+    # Force the next get_balance() to refetch, but keep the last value for /health
+    global _balance_cache_time, _balance_generation
+    with _balance_lock:
+        _balance_generation += 1
+        _balance_cache_time = float('-inf')
+
+def refresh_balance_async():
+    """Refresh the balance cache on a background thread, unless one already is"""
+    if not _balance_refresh_lock.acquire(blocking=False):
+        return
+    
+    def refresh():
+        try:
+            get_balance(refresh=True)
+        finally:
+            _balance_refresh_lock.release()
+    
+    threading.Thread(target=refresh, daemon=True).start()
+
+# ============= GET MARKETS (CACHED) =============
+def get_markets(refresh=False):
+    """
+    load_markets() hits the REST API and parses every symbol, so keep the
+    result for MARKETS_CACHE_TTL_SECONDS instead of reloading per order.
+    Both cached maps are read-only views, replaced wholesale on reload.
+    """
+    global _markets_cache, _markets_cache_time, _precision_cache
+    
+    markets = _markets_cache
+    if not refresh and markets is not None and time.monotonic() - _markets_cache_time < MARKETS_CACHE_TTL_SECONDS:
+        return markets
+    
+    with _markets_lock:
+        # Another thread may have refreshed while we waited for the lock
+        if not refresh and _markets_cache is not None and time.monotonic() - _markets_cache_time < MARKETS_CACHE_TTL_SECONDS:
+            return _markets_cache
+        
+        try:
+            markets = load_markets()
+        except Exception as e:
+            # Market metadata rarely changes, so a failed refresh keeps serving
+            # the old maps. Only raise if there are none, or for a forced reload
+            # (its caller reports the failure; the maps stay in place either way).
+            if refresh or _markets_cache is None:
+                raise
+            log_message(f"❌ Markets refresh error, keeping cached markets: {e}")
+            # Try again in MARKETS_RETRY_SECONDS rather than on every call
+            _markets_cache_time = time.monotonic() - MARKETS_CACHE_TTL_SECONDS + MARKETS_RETRY_SECONDS
+            return _markets_cache
+        
+        # Order paths only need precision, so pull it out once per reload.
+        # ccxt keys markets by unified symbol (BTC/USDT); alerts carry the id (btcusdt)
+        _precision_cache = types.MappingProxyType({
+            market['id']: market.get('precision') or {}
+            for market in markets.values()
+        })
+        _markets_cache = types.MappingProxyType(markets)
+        _markets_cache_time = time.monotonic()
+        return _markets_cache
+
+def get_precision(symbol):
+    """
+    Exchange precision for a market id (btcusdt), {} if unknown. WazirX uses
+    tick sizes, e.g. {'amount': 1e-05, 'price': 0.01}, so round through
+    exchange.amount_to_precision() / price_to_precision() rather than round().
+    """
+    get_markets()  # Reload if stale
+    return _precision_cache.get(symbol, {})
+
 # ============= GET CURRENT PRICE =============
-def get_current_price(symbol):
+def get_current_price(symbol, refresh=False):
+    if not refresh:
+        cached = _price_cache.get(symbol)
+        if cached and time.monotonic() - cached[1] < PRICE_CACHE_TTL_SECONDS:
+            return cached[0]
+    
     try:
-        ticker = exchange.fetch_ticker(symbol)
-        return ticker['last']
+        ticker = fetch_ticker(symbol)
+        price = ticker['last']
+        with _price_lock:
+            _price_cache[symbol] = (price, time.monotonic())
+        return price
     except Exception as e:
         log_message(f"❌ Price fetch error for {symbol}: {e}")
         return None
 
+def get_prices(symbols):
+    """
+    Current price per symbol with one fetch_tickers() request when the
+    exchange supports it, falling back to get_current_price() per symbol
+    """
+    prices = {}
+    
+    if symbols and exchange.has.get('fetchTickers'):
+        try:
+            tickers = fetch_tickers(list(symbols))
+            fetched_at = time.monotonic()
+            with _price_lock:
+                for symbol in symbols:
+                    # fetch_tickers keys results by unified symbol (BTC/USDT)
+                    ticker = tickers.get(symbol) or tickers.get(exchange.market(symbol)['symbol'])
+                    if ticker and ticker.get('last'):
+                        prices[symbol] = ticker['last']
+                        _price_cache[symbol] = (ticker['last'], fetched_at)
+        except Exception as e:
+            log_message(f"❌ Bulk price fetch error: {e}")
+    
+    for symbol in symbols:
+        if symbol not in prices:
+            prices[symbol] = get_current_price(symbol)
+    
+    return prices
+
 # ============= SAFETY CHECKS =============
-def check_safety_limits(data):
+def check_safety_limits(mapped_symbol):
     global daily_pnl_usdt
     reset_daily_tracker()
     
@@ -111,23 +434,20 @@ def check_safety_limits(data):
         return False, f"❌ Daily loss limit reached: ${abs(daily_pnl_usdt):.2f}"
     
     # Symbol Check
-    symbol = data.get('symbol', '')
-    mapped_symbol = SYMBOL_MAP.get(symbol, symbol).lower()
-    
     if mapped_symbol not in ALLOWED_SYMBOLS:
         return False, f"❌ Symbol not allowed: {mapped_symbol}"
     
-    # Balance Check
-    balance = get_balance()
-    if balance['usdt_free'] < MIN_BALANCE_USDT:
-        return False, f"❌ Insufficient balance: ${balance['usdt_free']:.2f}"
-    
     # Trading Hours Check (if restricted)
     if not TRADING_24_7:
         current_hour = datetime.now().hour
-        if current_hour in RESTRICTED_HOURS:
+        if _RESTRICTED_HOURS_MASK & (1 << current_hour):
             return False, f"❌ Trading restricted at {current_hour}:00 IST"
     
+    # Balance Check (last, it's the only one that may need a REST call)
+    balance = get_balance()
+    if balance['usdt_free'] < MIN_BALANCE_USDT:
+        return False, f"❌ Insufficient balance: ${balance['usdt_free']:.2f}"
+    
     return True, "✅ All safety checks passed"
 
 # ============= CALCULATE POSITION SIZE =============
@@ -160,15 +480,9 @@ def calculate_position_size(symbol, entry_price, stop_loss_price):
         # Convert to crypto quantity
         quantity = position_size_usdt / entry_price
         
-        # Get market info for precision
-        markets = exchange.load_markets()
-        market = markets.get(symbol.upper())
-        
-        if market:
-            # Round to exchange precision
-            precision = market['precision']['amount']
-            if precision:
-                quantity = round(quantity, precision)
+        # Round to exchange precision
+        if get_precision(symbol).get('amount') is not None:
+            quantity = float(exchange.amount_to_precision(symbol, quantity))
         
         # Minimum order size check (WazirX minimum ~$1)
         min_order_usdt = 1.0
@@ -202,42 +516,42 @@ def place_order(symbol, side, quantity, entry_price, sl_price, tp_price):
             limit_price = entry_price * (1 - SLIPPAGE_PERCENT / 100)
         
         # Round price to exchange precision
-        markets = exchange.load_markets()
-        market = markets.get(symbol.upper())
-        if market and market['precision']['price']:
-            price_precision = market['precision']['price']
-            limit_price = round(limit_price, price_precision)
+        if get_precision(symbol).get('price') is not None:
+            limit_price = float(exchange.price_to_precision(symbol, limit_price))
         
-        # Place limit order
+        # Place limit order (ccxt resolves the lowercase market id)
         order = exchange.create_limit_order(
-            symbol=symbol.upper(),
+            symbol=symbol,
             side=side,
             amount=quantity,
             price=limit_price
         )
         
         log_message(f"✅ Order placed: {order['id']} | {side.upper()} {quantity} {symbol} @ ${limit_price}")
+        invalidate_balance_cache()  # Funds are now locked in the order
         
         # Store order info for SL/TP management
-        active_orders[order['id']] = {
-            'symbol': symbol,
-            'side': side,
-            'quantity': quantity,
-            'entry_price': limit_price,
-            'sl_price': sl_price,
-            'tp_price': tp_price,
-            'timestamp': datetime.now()
-        }
-        
-        # Send Telegram notification
-        msg = f"🚀 <b>Order Placed</b>\n"
-        msg += f"Symbol: {symbol.upper()}\n"
-        msg += f"Side: {side.upper()}\n"
-        msg += f"Quantity: {quantity}\n"
-        msg += f"Price: ${limit_price:.2f}\n"
-        msg += f"SL: ${sl_price:.2f}\n"
-        msg += f"TP: ${tp_price:.2f}"
-        send_telegram(msg)
+        add_active_order(order['id'], Order(
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            entry_price=limit_price,
+            sl_price=sl_price,
+            tp_price=tp_price,
+            timestamp=datetime.now()
+        ))
+        
+        # Send Telegram notification (only format it if it will be sent)
+        if TELEGRAM_ENABLED:
+            send_telegram(
+                f"🚀 <b>Order Placed</b>\n"
+                f"Symbol: {symbol}\n"
+                f"Side: {side.upper()}\n"
+                f"Quantity: {quantity}\n"
+                f"Price: ${limit_price:.2f}\n"
+                f"SL: ${sl_price:.2f}\n"
+                f"TP: ${tp_price:.2f}"
+            )
         
         return order
         
@@ -247,31 +561,112 @@ def place_order(symbol, side, quantity, entry_price, sl_price, tp_price):
         return None
 
 # ============= MONITOR ORDERS (SL/TP Management) =============
+# Shared pool so one monitor pass overlaps its exchange round-trips
+monitor_executor = ThreadPoolExecutor(max_workers=MONITOR_MAX_WORKERS, thread_name_prefix="monitor")
+
+def fetch_order_status(order_id, symbol):
+    try:
+        return fetch_order(order_id, symbol)['status']
+    except Exception:
+        return None
+
+def close_position(order_id, current_price, close_reason):
+    # Claim the order before any network I/O; the lock is held for one pop
+    order_info = pop_active_order(order_id)
+    if order_info is None:
+        return
+    
+    symbol = order_info.symbol
+    side = order_info.side
+    entry_price = order_info.entry_price
+    quantity = order_info.quantity
+    
+    try:
+        close_side = 'sell' if side == 'buy' else 'buy'
+        close_order = exchange.create_market_order(
+            symbol=symbol,
+            side=close_side,
+            amount=quantity
+        )
+    except ccxt.ExchangeError as e:
+        log_message(f"❌ Position close error for {order_id}: {e}")
+        # Rejected by the exchange, so still open: hand it back to the monitor for the next pass
+        add_active_order(order_id, order_info, wake_monitor=False)
+        return
+    except Exception as e:
+        # Timeouts / network errors: the market order may have filled anyway, and
+        # retrying could close twice. Leave it to a human to reconcile.
+        log_message(f"❌ Position close outcome unknown for {order_id}: {e}")
+        send_telegram(
+            f"⚠️ <b>Close Unconfirmed</b>\n"
+            f"Order: {order_id}\n"
+            f"Reason: {close_reason}\n"
+            f"Symbol: {symbol} {side.upper()} {quantity}\n"
+            f"Error: {e}\n"
+            f"Check WazirX and close manually if still open"
+        )
+        return
+    
+    try:
+        invalidate_balance_cache()
+        
+        # Calculate P&L
+        if side == 'buy':
+            pnl = (current_price - entry_price) * quantity
+        else:
+            pnl = (entry_price - current_price) * quantity
+        
+        global daily_pnl_usdt, winning_trades_today, losing_trades_today
+        with counters_lock:
+            daily_pnl_usdt += pnl
+            if pnl > 0:
+                winning_trades_today += 1
+            else:
+                losing_trades_today += 1
+        
+        log_message(f"🔔 Position closed: {close_reason} | P&L: ${pnl:.2f}")
+        
+        # Telegram notification (only format it if it will be sent)
+        if TELEGRAM_ENABLED:
+            emoji = "✅" if pnl > 0 else "❌"
+            send_telegram(
+                f"{emoji} <b>Position Closed</b>\n"
+                f"Reason: {close_reason}\n"
+                f"P&L: ${pnl:.2f}\n"
+                f"Symbol: {symbol}"
+            )
+        
+    except Exception as e:
+        log_message(f"❌ Position close bookkeeping error for {order_id}: {e}")
+
 def monitor_active_orders():
     """
     WazirX doesn't support native SL/TP, so we monitor manually
     """
     try:
-        for order_id, order_info in list(active_orders.items()):
-            symbol = order_info['symbol']
-            current_price = get_current_price(symbol.upper())
+        orders_to_monitor = active_orders.items()  # snapshot, see ACTIVE ORDERS TRACKING
+        
+        # Order status checks run concurrently instead of one after another
+        status_futures = {
+            order_id: monitor_executor.submit(fetch_order_status, order_id, order_info.symbol)
+            for order_id, order_info in orders_to_monitor
+        }
+        prices = get_prices({order_info.symbol for _, order_info in orders_to_monitor})
+        close_futures = []
+        
+        for order_id, order_info in orders_to_monitor:
+            current_price = prices[order_info.symbol]
             
             if not current_price:
                 continue
             
-            entry_price = order_info['entry_price']
-            sl_price = order_info['sl_price']
-            tp_price = order_info['tp_price']
-            side = order_info['side']
-            quantity = order_info['quantity']
+            sl_price = order_info.sl_price
+            tp_price = order_info.tp_price
+            side = order_info.side
             
             # Check if order is filled
-            try:
-                order_status = exchange.fetch_order(order_id, symbol.upper())
-                if order_status['status'] != 'closed':
-                    continue  # Order not filled yet
-            except:
-                continue
+            if status_futures[order_id].result() != 'closed':
+                continue  # Order not filled yet (or status unavailable)
             
             # Check SL/TP conditions
             should_close = False
@@ -296,75 +691,101 @@ def monitor_active_orders():
             
             # Close position if needed
             if should_close:
-                close_side = 'sell' if side == 'buy' else 'buy'
-                close_order = exchange.create_market_order(
-                    symbol=symbol.upper(),
-                    side=close_side,
-                    amount=quantity
-                )
-                
-                # Calculate P&L
-                if side == 'buy':
-                    pnl = (current_price - entry_price) * quantity
-                else:
-                    pnl = (entry_price - current_price) * quantity
-                
-                global daily_pnl_usdt, winning_trades_today, losing_trades_today
-                daily_pnl_usdt += pnl
-                
-                if pnl > 0:
-                    winning_trades_today += 1
-                else:
-                    losing_trades_today += 1
-                
-                log_message(f"🔔 Position closed: {close_reason} | P&L: ${pnl:.2f}")
-                
-                # Telegram notification
-                emoji = "✅" if pnl > 0 else "❌"
-                msg = f"{emoji} <b>Position Closed</b>\n"
-                msg += f"Reason: {close_reason}\n"
-                msg += f"P&L: ${pnl:.2f}\n"
-                msg += f"Symbol: {symbol.upper()}"
-                send_telegram(msg)
-                
-                # Remove from active orders
-                del active_orders[order_id]
-                
+                close_futures.append(monitor_executor.submit(
+                    close_position, order_id, current_price, close_reason
+                ))
+        
+        # Positions that hit SL/TP in this pass are closed concurrently; wait for
+        # them so the next pass can't see (and re-close) an in-flight position
+        for future in close_futures:
+            future.result()
+        
     except Exception as e:
         log_message(f"❌ Order monitoring error: {e}")
 
+# ============= ALERT PARSING =============
+@dataclass(slots=True, frozen=True)
+class Alert:
+    action: str  # BUY / SELL
+    symbol: str  # WazirX format (btcusdt)
+    price: float
+    sl: float
+    tp: float
+
+def parse_alert(data):
+    """
+    Turn a TradingView payload (a dict) into a typed, validated Alert in one
+    pass, before any exchange call. Raises ValueError, with a client-facing
+    reason, on an unknown action, a non-string symbol or a missing/
+    non-numeric/non-finite/non-positive price/SL/TP.
+    """
+    action = str(data.get('action', '')).upper()
+    if action not in ('BUY', 'SELL'):
+        raise ValueError("Invalid action")
+    
+    symbol = data.get('symbol', '')
+    if not isinstance(symbol, str):
+        raise ValueError("Invalid symbol")
+    
+    try:
+        price = float(data.get('price', 0))
+        sl = float(data.get('sl', 0))
+        tp = float(data.get('tp', 0))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid price/SL/TP")
+    
+    # float() and json.loads() both accept NaN/Infinity, which slip past `<= 0`
+    if not (math.isfinite(price) and math.isfinite(sl) and math.isfinite(tp)):
+        raise ValueError("Invalid price/SL/TP")
+    
+    if price <= 0 or sl <= 0 or tp <= 0:
+        raise ValueError("Invalid price/SL/TP")
+    
+    return Alert(
+        action=action,
+        symbol=resolve_symbol(symbol),
+        price=price,
+        sl=sl,
+        tp=tp
+    )
+
 # ============= WEBHOOK ENDPOINT =============
 @app.route('/webhook', methods=['POST'])
 def webhook():
     try:
-        data = request.json
+        # Decode the body directly: skips Flask's request.json machinery and
+        # accepts TradingView alerts sent as text/plain
+        raw = request.get_data(cache=False)
         log_message("\n" + "="*80)
-        log_message(f"📨 ALERT RECEIVED | {datetime.now()}")
-        log_message(json.dumps(data, indent=2))
+        log_message(f"📨 ALERT RECEIVED | {raw.decode('utf-8', 'replace')}")
         log_message("="*80)
         
-        # Safety checks
-        is_safe, msg = check_safety_limits(data)
-        if not is_safe:
-            log_message(msg)
-            return jsonify({"status": "rejected", "reason": msg}), 400
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return jsonify({"status": "error", "reason": "Invalid JSON"}), 400
         
-        # Extract data
-        action = data.get('action', '').upper()
-        tv_symbol = data.get('symbol', '')
-        price = float(data.get('price', 0))
-        sl = float(data.get('sl', 0))
-        tp = float(data.get('tp', 0))
+        if not isinstance(data, dict):
+            return jsonify({"status": "error", "reason": "Alert must be a JSON object"}), 400
         
-        # Map symbol to WazirX format
-        symbol = SYMBOL_MAP.get(tv_symbol, tv_symbol).lower()
+        # Extract data (symbol mapped to WazirX format)
+        try:
+            alert = parse_alert(data)
+        except ValueError as e:
+            log_message(f"❌ Invalid alert: {e}")
+            return jsonify({"status": "error", "reason": str(e)}), 400
         
-        # Validate
-        if action not in ['BUY', 'SELL']:
-            return jsonify({"status": "error", "reason": "Invalid action"}), 400
+        symbol = alert.symbol
+        action = alert.action
+        price = alert.price
+        sl = alert.sl
+        tp = alert.tp
         
-        if price <= 0 or sl <= 0 or tp <= 0:
-            return jsonify({"status": "error", "reason": "Invalid price/SL/TP"}), 400
+        # Safety checks
+        is_safe, msg = check_safety_limits(symbol)
+        if not is_safe:
+            log_message(msg)
+            return jsonify({"status": "rejected", "reason": msg}), 400
         
         # Calculate position size
         side = 'buy' if action == 'BUY' else 'sell'
@@ -378,7 +799,9 @@ def webhook():
         
         if order:
             global total_trades_today
-            total_trades_today += 1
+            with counters_lock:
+                total_trades_today += 1
+                trades_today = total_trades_today
             
             return jsonify({
                 "status": "success",
@@ -389,7 +812,7 @@ def webhook():
                 "entry_price": price,
                 "sl": sl,
                 "tp": tp,
-                "trades_today": total_trades_today
+                "trades_today": trades_today
             }), 200
         else:
             return jsonify({"status": "error", "reason": "Order placement failed"}), 500
@@ -402,16 +825,26 @@ def webhook():
 @app.route('/health', methods=['GET'])
 def health():
     try:
-        balance = get_balance()
+        # Serve the cached balance so health probes never wait on WazirX
+        balance = _balance_cache
+        balance_stale = balance is None or time.monotonic() - _balance_cache_time > HEALTH_BALANCE_MAX_AGE_SECONDS
+        if balance_stale:
+            refresh_balance_async()
+        
+        with counters_lock:
+            stats = {
+                "daily_pnl_usdt": daily_pnl_usdt,
+                "trades_today": total_trades_today,
+                "winning_trades": winning_trades_today,
+                "losing_trades": losing_trades_today
+            }
         
         return jsonify({
             "status": "running",
             "exchange": "WazirX",
-            "balance_usdt": balance['usdt_free'],
-            "daily_pnl_usdt": daily_pnl_usdt,
-            "trades_today": total_trades_today,
-            "winning_trades": winning_trades_today,
-            "losing_trades": losing_trades_today,
+            "balance_usdt": balance['usdt_free'] if balance else None,
+            "balance_stale": balance_stale,
+            **stats,
             "active_orders": len(active_orders),
             "time": str(datetime.now())
         }), 200
@@ -421,20 +854,38 @@ def health():
 # ============= GET POSITIONS =============
 @app.route('/positions', methods=['GET'])
 def get_positions():
+    orders = active_orders
     return jsonify({
-        "active_orders": len(active_orders),
-        "orders": list(active_orders.values())
+        "active_orders": len(orders),
+        "orders": [asdict(order) for order in orders.values()]
     }), 200
 
+# ============= RELOAD MARKETS =============
+@app.route('/reload-markets', methods=['POST'])
+def reload_markets():
+    """Pick up new listings / precision changes without waiting for the TTL"""
+    token = request.headers.get('X-Admin-Token', '')
+    # Compare bytes: compare_digest() raises TypeError on non-ASCII str
+    if not ADMIN_TOKEN or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        return jsonify({"status": "error", "reason": "Forbidden"}), 403
+    
+    try:
+        markets = get_markets(refresh=True)
+        log_message(f"✅ Markets reloaded: {len(markets)} symbols")
+        return jsonify({"status": "reloaded", "markets": len(markets)}), 200
+    except Exception as e:
+        log_message(f"❌ Markets reload error: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 # ============= BACKGROUND ORDER MONITOR =============
 def start_order_monitor():
-    import threading
-    
     def monitor_loop():
         while True:
             try:
+                order_event.clear()
                 monitor_active_orders()
-                time.sleep(5)  # Check every 5 seconds
+                # Poll while orders are open, otherwise idle until place_order wakes us
+                order_event.wait(ORDER_CHECK_INTERVAL_SECONDS if active_orders else IDLE_CHECK_INTERVAL_SECONDS)
             except Exception as e:
                 log_message(f"❌ Monitor loop error: {e}")
                 time.sleep(10)
@@ -443,17 +894,51 @@ def start_order_monitor():
     monitor_thread.start()
     log_message("✅ Order monitor thread started")
 
+# ============= STARTUP =============
+_started = False
+_startup_lock = threading.Lock()
+
+def preload_markets():
+    try:
+        get_markets()
+    except Exception as e:
+        log_message(f"❌ Markets preload error: {e}")
+
+def start_bot():
+    """
+    Log the startup banner and start the order monitor, once per process.
+    Runs on the first request when served by a WSGI server (see README).
+    """
+    global _started
+    if _started:
+        return
+    
+    with _startup_lock:
+        if _started:
+            return
+        
+        log_message("\n" + "="*80)
+        log_message("🚀 WAZIRX ICT TRADING BOT STARTING...")
+        log_message(f"Trading Enabled: {TRADING_ENABLED}")
+        log_message(f"Dry Run: {DRY_RUN}")
+        log_message(f"Allowed Symbols: {', '.join(sorted(ALLOWED_SYMBOLS))}")
+        log_message("="*80 + "\n")
+        
+        # Warm the markets/precision cache in the background so neither this
+        # request nor the ones queued behind _startup_lock wait on WazirX
+        threading.Thread(target=preload_markets, daemon=True).start()
+        
+        # Start order monitoring
+        start_order_monitor()
+        _started = True
+
+@app.before_request
+def ensure_started():
+    start_bot()
+
 # ============= MAIN =============
 if __name__ == '__main__':
-    log_message("\n" + "="*80)
-    log_message("🚀 WAZIRX ICT TRADING BOT STARTING...")
-    log_message(f"Trading Enabled: {TRADING_ENABLED}")
-    log_message(f"Dry Run: {DRY_RUN}")
-    log_message(f"Allowed Symbols: {ALLOWED_SYMBOLS}")
-    log_message("="*80 + "\n")
-    
-    # Start order monitoring
-    start_order_monitor()
+    start_bot()
     
-    # Start Flask server
+    # Start Flask server (development only, use gunicorn in production)
     app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
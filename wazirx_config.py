@@ -33,8 +33,20 @@ ORDER_TYPE = "limit"  # WazirX works better with limit orders
 SLIPPAGE_PERCENT = 0.2  # 0.2% slippage for limit orders
 ORDER_TIMEOUT_SECONDS = 30  # Cancel order if not filled
 
+# ============= ORDER MONITOR =============
+ORDER_CHECK_INTERVAL_SECONDS = 5  # Poll interval while orders are open
+IDLE_CHECK_INTERVAL_SECONDS = 30  # Poll interval with no open orders
+MONITOR_MAX_WORKERS = 4  # Parallel exchange requests per monitor pass
+
+# ============= CACHING =============
+MARKETS_CACHE_TTL_SECONDS = 3600  # Reload market metadata (precision etc.) hourly
+MARKETS_RETRY_SECONDS = 60  # After a failed reload, keep the old markets and retry this often
+PRICE_CACHE_TTL_SECONDS = 2  # Reuse a fetched ticker price for this long
+BALANCE_CACHE_TTL_SECONDS = 10  # Reuse the fetched USDT balance for this long
+HEALTH_BALANCE_MAX_AGE_SECONDS = 30  # /health refreshes the balance in background past this
+
 # ============= ALLOWED TRADING =============
-ALLOWED_SYMBOLS = ["btcusdt", "ethusdt", "bnbusdt", "solusdt"]
+ALLOWED_SYMBOLS = frozenset({"btcusdt", "ethusdt", "bnbusdt", "solusdt"})  # lowercase, O(1) lookup
 TRADING_ENABLED = True
 DRY_RUN = False  # Set True for testing without real orders
 
@@ -54,6 +66,11 @@ TELEGRAM_ENABLED = False
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 
+# ============= ADMIN ENDPOINTS =============
+# Shared secret for admin endpoints (/reload-markets), sent as X-Admin-Token.
+# Leave empty to disable them.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
 # ============= LOGGING =============
 LOG_TRADES_TO_FILE = True
 LOG_FILE_PATH = "trades_log.txt"
\ No newline at end of file